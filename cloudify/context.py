@@ -26,6 +26,8 @@ from cloudify import exceptions
 from cloudify import utils
 from cloudify.constants import DEPLOYMENT, NODE_INSTANCE, RELATIONSHIP_INSTANCE
 
+_MISSING = object()
+
 
 class ContextCapabilities(object):
     """Maps from instance relationship target ids to their respective
@@ -35,20 +37,53 @@ class ContextCapabilities(object):
         self._endpoint = endpoint
         self.instance = instance
         self._relationship_runtimes = None
+        self._index = None
+        self._single = None
+        self._ambiguous = None
+
+    def _build_index(self):
+        """Map every capability key to the runtime properties providing it.
+
+        Keys provided by more than one node are recorded as ambiguous. Values
+        are read from the runtime properties at lookup time, so they stay
+        consistent with get_all().
+        """
+        capabilities = self._capabilities
+        index = {}
+        ambiguous = set()
+        if len(capabilities) == 1:
+            # the common single dependency case: nothing to merge, look keys
+            # up directly in the node's (live) runtime properties
+            self._single, = capabilities.values()
+        else:
+            for caps in capabilities.values():
+                for key in caps:
+                    if key in index:
+                        ambiguous.add(key)
+                    index[key] = caps
+        self._index = index
+        self._ambiguous = ambiguous
 
     def _find_item(self, key):
         """
-        Returns the capability for the provided key by iterating through all
-        dependency nodes available capabilities.
+        Returns the capability for the provided key by looking it up in the
+        runtime properties of the dependency node providing it.
         """
-        ls = [caps for caps in self._capabilities.values() if key in caps]
-        if len(ls) == 0:
+        if self._index is None:
+            self._build_index()
+        caps = self._single
+        if caps is None:
+            if key in self._ambiguous:
+                raise exceptions.NonRecoverableError(
+                    "'{0}' capability ambiguity [capabilities={1}]".format(
+                        key, self._capabilities))
+            caps = self._index.get(key)
+            if caps is None:
+                return False, None
+        value = caps.get(key, _MISSING)
+        if value is _MISSING:
             return False, None
-        if len(ls) > 1:
-            raise exceptions.NonRecoverableError(
-                "'{0}' capability ambiguity [capabilities={1}]".format(
-                    key, self._capabilities))
-        return True, ls[0][key]
+        return True, value
 
     def __getitem__(self, key):
         found, value = self._find_item(key)
@@ -67,18 +102,21 @@ class ContextCapabilities(object):
         return self._capabilities
 
     def __str__(self):
-        return ('<' + self.__class__.__name__ + ' ' +
-                str(self._capabilities) + '>')
+        # don't fetch the relationships from storage just to render them
+        capabilities = self._relationship_runtimes
+        if capabilities is None:
+            capabilities = '<unloaded>'
+        return '<{0} {1}>'.format(self.__class__.__name__, capabilities)
 
     @property
     def _capabilities(self):
         if self._relationship_runtimes is None:
-            self._relationship_runtimes = {}
+            relationship_runtimes = {}
             for relationship in self.instance.relationships:
-                self._relationship_runtimes.update({
-                    relationship.target.instance.id:
-                    relationship.target.instance.runtime_properties
-                })
+                target_instance = relationship.target.instance
+                relationship_runtimes[target_instance.id] = \
+                    target_instance.runtime_properties
+            self._relationship_runtimes = relationship_runtimes
         return self._relationship_runtimes
 
 
@@ -289,13 +327,15 @@ class NodeContext(EntityContext):
     def __init__(self, *args, **kwargs):
         super(NodeContext, self).__init__(*args, **kwargs)
         self._endpoint = kwargs['endpoint']
+        self._name = self._context.get('node_name')
         self._node = None
 
     def _get_node_if_needed(self):
         if self._node is None:
-            self._node = self._endpoint.get_node(self.id)
+            self._node = self._endpoint.get_node(self._name)
             props = self._node.get('properties', {})
             self._node['properties'] = ImmutableProperties(props)
+        return self._node
 
     @property
     def id(self):
@@ -305,27 +345,24 @@ class NodeContext(EntityContext):
     @property
     def name(self):
         """The node's name"""
-        return self._context.get('node_name')
+        return self._name
 
     @property
     def properties(self):
         """The node properties as dict (read-only).
         These properties are the properties specified in the blueprint.
         """
-        self._get_node_if_needed()
-        return self._node.properties
+        return self._get_node_if_needed().properties
 
     @property
     def type(self):
         """The node's type"""
-        self._get_node_if_needed()
-        return self._node.type
+        return self._get_node_if_needed().type
 
     @property
     def type_hierarchy(self):
         """The node's type hierarchy"""
-        self._get_node_if_needed()
-        return self._node.type_hierarchy
+        return self._get_node_if_needed().type_hierarchy
 
 
 class NodeInstanceContext(EntityContext):
@@ -334,23 +371,26 @@ class NodeInstanceContext(EntityContext):
         self._endpoint = kwargs['endpoint']
         self._node = kwargs['node']
         self._modifiable = kwargs['modifiable']
+        self._id = self._context.get('node_id')
         self._node_instance = None
         self._host_ip = None
         self._relationships = None
 
     def _get_node_instance(self):
-        self._node_instance = self._endpoint.get_node_instance(self.id)
-        self._node_instance.runtime_properties.modifiable = \
-            self._modifiable
+        node_instance = self._endpoint.get_node_instance(self._id)
+        node_instance.runtime_properties.modifiable = self._modifiable
+        self._node_instance = node_instance
+        return node_instance
 
     def _get_node_instance_if_needed(self):
         if self._node_instance is None:
-            self._get_node_instance()
+            return self._get_node_instance()
+        return self._node_instance
 
     @property
     def id(self):
         """The node instance id."""
-        return self._context.get('node_id')
+        return self._id
 
     @property
     def runtime_properties(self):
@@ -360,13 +400,12 @@ class NodeInstanceContext(EntityContext):
         lifecycle.
         Retrieving runtime properties involves a call to Cloudify's storage.
         """
-        self._get_node_instance_if_needed()
-        return self._node_instance.runtime_properties
+        return self._get_node_instance_if_needed().runtime_properties
 
     @runtime_properties.setter
     def runtime_properties(self, new_properties):
-        self._get_node_instance_if_needed()
-        self._node_instance.runtime_properties = new_properties
+        self._get_node_instance_if_needed().runtime_properties = \
+            new_properties
 
     def update(self, on_conflict=None):
         """
@@ -433,16 +472,17 @@ class NodeInstanceContext(EntityContext):
         self._get_node_instance()
 
     def _get_node_instance_ip_if_needed(self):
-        self._get_node_instance_if_needed()
         if self._host_ip is None:
-            if self.id == self._node_instance.host_id:
+            node_instance = self._get_node_instance_if_needed()
+            host_id = node_instance.host_id
+            if self._id == host_id:
                 self._host_ip = self._endpoint.get_host_node_instance_ip(
-                    host_id=self.id,
+                    host_id=self._id,
                     properties=self._node.properties,
-                    runtime_properties=self.runtime_properties)
+                    runtime_properties=node_instance.runtime_properties)
             else:
                 self._host_ip = self._endpoint.get_host_node_instance_ip(
-                    host_id=self._node_instance.host_id)
+                    host_id=host_id)
 
     @property
     def host_ip(self):
@@ -464,17 +504,16 @@ class NodeInstanceContext(EntityContext):
         :return: list of RelationshipContext
         :rtype: list
         """
-        self._get_node_instance_if_needed()
+        node_instance = self._get_node_instance_if_needed()
         if self._relationships is None:
             self._relationships = [
                 RelationshipContext(relationship, self._endpoint, self._node)
-                for relationship in self._node_instance.relationships]
+                for relationship in node_instance.relationships]
         return self._relationships
 
     @property
     def index(self):
-        self._get_node_instance_if_needed()
-        return self._node_instance.index
+        return self._get_node_instance_if_needed().index
 
 
 class RelationshipContext(EntityContext):
@@ -508,11 +547,11 @@ class RelationshipContext(EntityContext):
     def type_hierarchy(self):
         """The relationship type hierarchy"""
         if self._type_hierarchy is None:
-            self._node._get_node_if_needed()
-            node_relationships = self._node._node.relationships
+            node_relationships = self._node._get_node_if_needed().relationships
+            relationship_type = self.type
             self._type_hierarchy = [
                 r for r in node_relationships if
-                r['type'] == self.type][0]['type_hierarchy']
+                r['type'] == relationship_type][0]['type_hierarchy']
         return self._type_hierarchy
 
 
@@ -559,6 +598,11 @@ class CloudifyContext(CommonContext):
         self._bootstrap_context = None
         self._rest_host = self._context.get('rest_host')
         self._rest_ssl_cert = self._context.get('rest_ssl_cert')
+        self._execution_id = self._context.get('execution_id')
+        self._task_id = self._context.get('task_id')
+        self._task_name = self._context.get('task_name')
+        self._task_target = self._context.get('task_target')
+        self._task_queue = self._context.get('task_queue')
         self._node = None
         self._instance = None
         self._source = None
@@ -568,12 +612,14 @@ class CloudifyContext(CommonContext):
         self._tenant = None
 
         capabilities_node_instance = None
-        if 'related' in self._context:
-            if self._context['related']['is_target']:
+        related = self._context.get('related')
+        if related is not None:
+            is_target = related['is_target']
+            if is_target:
                 source_context = self._context
-                target_context = self._context['related']
+                target_context = related
             else:
-                source_context = self._context['related']
+                source_context = related
                 target_context = self._context
             self._source = RelationshipSubjectContext(source_context,
                                                       self._endpoint,
@@ -581,7 +627,7 @@ class CloudifyContext(CommonContext):
             self._target = RelationshipSubjectContext(target_context,
                                                       self._endpoint,
                                                       modifiable=True)
-            if self._context['related']['is_target']:
+            if is_target:
                 capabilities_node_instance = self._source.instance
             else:
                 capabilities_node_instance = self._target.instance
@@ -595,8 +641,8 @@ class CloudifyContext(CommonContext):
                                                  modifiable=True)
             capabilities_node_instance = self._instance
 
-        self._capabilities = ContextCapabilities(self._endpoint,
-                                                 capabilities_node_instance)
+        self._capabilities_node_instance = capabilities_node_instance
+        self._capabilities = None
 
         plugin = self._context.get('plugin', {})
         # Because we inherit from str, we can't really change the constructor
@@ -696,7 +742,7 @@ class CloudifyContext(CommonContext):
         The workflow execution id the plugin invocation was requested from.
         This is a unique value which identifies a specific workflow execution.
         """
-        return self._context.get('execution_id')
+        return self._execution_id
 
     @property
     def execution_token(self):
@@ -748,22 +794,22 @@ class CloudifyContext(CommonContext):
     @property
     def task_id(self):
         """The plugin's task invocation unique id."""
-        return self._context.get('task_id')
+        return self._task_id
 
     @property
     def task_name(self):
         """The full task name of the invoked task."""
-        return self._context.get('task_name')
+        return self._task_name
 
     @property
     def task_target(self):
         """The task target (agent worker name)."""
-        return self._context.get('task_target')
+        return self._task_target
 
     @property
     def task_queue(self):
         """The task target (agent queue name)."""
-        return self._context.get('task_queue')
+        return self._task_queue
 
     @property
     def plugin(self):
@@ -796,6 +842,9 @@ class CloudifyContext(CommonContext):
         self._verify_in_node_or_relationship_context()
         warnings.warn('capabilities is deprecated, use instance.relationships'
                       'instead', DeprecationWarning)
+        if self._capabilities is None:
+            self._capabilities = ContextCapabilities(
+                self._endpoint, self._capabilities_node_instance)
         return self._capabilities
 
     @property
@@ -968,8 +1017,8 @@ class CloudifyContext(CommonContext):
     def _init_cloudify_logger(self):
         logger_name = self.task_id if self.task_id is not None \
             else 'cloudify_plugin'
-        handler = self._endpoint.get_logging_handler()
-        return init_cloudify_logger(handler, logger_name)
+        return init_cloudify_logger(None, logger_name,
+                                    endpoint=self._endpoint)
 
     def _add_context_to_template_variables(self, template_variables):
 
@@ -92,6 +92,9 @@ class Endpoint(object):
     def get_logging_handler(self):
         raise NotImplementedError('Implemented by subclasses')
 
+    def get_logging_out_func(self):
+        raise NotImplementedError('Implemented by subclasses')
+
     def send_plugin_event(self,
                           message=None,
                           args=None,
@@ -217,8 +220,11 @@ class ManagerEndpoint(Endpoint):
         return manager.get_bootstrap_context()
 
     def get_logging_handler(self):
-        return CloudifyPluginLoggingHandler(self.ctx,
-                                            out_func=logs.amqp_log_out)
+        return CloudifyPluginLoggingHandler(
+            self.ctx, out_func=self.get_logging_out_func())
+
+    def get_logging_out_func(self):
+        return logs.amqp_log_out
 
     def send_plugin_event(self,
                           message=None,
@@ -353,8 +359,11 @@ class LocalEndpoint(Endpoint):
         return self.get_provider_context().get('cloudify', {})
 
     def get_logging_handler(self):
-        return CloudifyPluginLoggingHandler(self.ctx,
-                                            out_func=logs.stdout_log_out)
+        return CloudifyPluginLoggingHandler(
+            self.ctx, out_func=self.get_logging_out_func())
+
+    def get_logging_out_func(self):
+        return logs.stdout_log_out
 
     def send_plugin_event(self,
                           message=None,
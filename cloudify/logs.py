@@ -101,9 +101,14 @@ class CloudifyBaseLoggingHandler(logging.Handler):
 
     def __init__(self, ctx, out_func, message_context_builder):
         logging.Handler.__init__(self)
+        self._message_context_builder = message_context_builder
         self.context = message_context_builder(ctx)
         self.out_func = out_func or amqp_log_out
 
+    def set_context(self, ctx):
+        """Send further messages with the message context of ctx"""
+        self.context = self._message_context_builder(ctx)
+
     def flush(self):
         pass
 
@@ -166,25 +171,71 @@ class CloudifyCtxLoggingHandler(logging.Handler):
         self.ctx.logger.log(record.levelno, message)
 
 
+class _MessageFormatter(logging.Formatter):
+    """Formats a record as just its message (plus any exception info).
+
+    Equivalent to ``logging.Formatter('%(message)s')``, without the
+    per-record string interpolation of the format.
+    """
+
+    def __init__(self):
+        logging.Formatter.__init__(self, '%(message)s')
+
+    def formatMessage(self, record):
+        # only called on python 3; python 2 falls back to the format string
+        return record.message
+
+
+_message_formatter = _MessageFormatter()
+
+
+def _reusable_handler(logger, endpoint):
+    """Find a handler that an endpoint like this one attached to logger"""
+    out_func = endpoint.get_logging_out_func()
+    for h in logger.handlers:
+        if isinstance(h, CloudifyBaseLoggingHandler) \
+                and getattr(h, '_endpoint_type', None) is type(endpoint) \
+                and h.out_func is out_func:
+            return h
+    return None
+
+
 def init_cloudify_logger(handler, logger_name,
-                         logging_level=logging.DEBUG):
+                         logging_level=logging.DEBUG,
+                         endpoint=None):
     """
     Instantiate an amqp backed logger based on the provided handler
     for sending log messages to RabbitMQ
 
-    :param handler: A logger handler based on the context
+    :param handler: A logger handler based on the context; ignored when
+                    endpoint is provided
     :param logger_name: The logger name
     :param logging_level: The logging level
+    :param endpoint: The endpoint of a plugin context. If an endpoint of the
+                     same type already attached a handler with the same
+                     output function to the logger, that handler is pointed
+                     at the endpoint's context and reused. Otherwise the
+                     endpoint's logging handler is used.
     :return: An amqp backed logger
     """
 
     # TODO: somehow inject logging level (no one currently passes
     # logging_level)
     logger = logging.getLogger('ctx.{0}'.format(logger_name))
+    if endpoint is not None:
+        handler = _reusable_handler(logger, endpoint)
+        if handler is not None:
+            handler.set_context(endpoint.ctx)
+        else:
+            handler = endpoint.get_logging_handler()
+            handler._endpoint_type = type(endpoint)
     logger.setLevel(logging_level)
-    for h in logger.handlers:
-        logger.removeHandler(h)
-    handler.setFormatter(logging.Formatter("%(message)s"))
+    # drop handlers left by a previous context that used the same logger
+    # name; iterate over a copy, since removeHandler mutates the list
+    for h in logger.handlers[:]:
+        if h is not handler:
+            logger.removeHandler(h)
+    handler.setFormatter(_message_formatter)
     handler.setLevel(logging_level)
     logger.addHandler(handler)
     return logger
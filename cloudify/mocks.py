@@ -190,6 +190,9 @@ class MockCloudifyContext(CloudifyContext):
 
     @property
     def capabilities(self):
+        if self._capabilities is None:
+            self._capabilities = ContextCapabilities(self._endpoint,
+                                                     self._instance)
         return self._capabilities
 
     @property
@@ -30,8 +30,10 @@ from cloudify_rest_client.exceptions import CloudifyClientError
 from cloudify.utils import create_temp_folder
 from cloudify.decorators import operation
 from cloudify.manager import NodeInstance
+from cloudify.mocks import MockCloudifyContext
 from cloudify.workflows import local
-from cloudify import constants, state, context, exceptions, conflict_handlers
+from cloudify import (constants, state, context, exceptions, conflict_handlers,
+                      logs)
 
 import cloudify.tests as tests_path
 from cloudify.test_utils import workflow_test
@@ -486,6 +488,106 @@ class TestPropertiesRefresh(testtools.TestCase):
             "Instance properties were not overwritten but force was used")
 
 
+class TestContextLogger(testtools.TestCase):
+    def _cleanup_logger(self, name):
+        logger = logging.getLogger('ctx.{0}'.format(name))
+        self.addCleanup(setattr, logger, 'handlers', [])
+
+    def test_logging_handler_reused(self):
+        self._cleanup_logger('reused_handler')
+        ctx1 = context.CloudifyContext({
+            'local': True, 'task_id': 'reused_handler', 'execution_id': 'e1'})
+        ctx2 = context.CloudifyContext({
+            'local': True, 'task_id': 'reused_handler', 'execution_id': 'e2'})
+        handler, = ctx1.logger.handlers
+        self.assertEqual('e1', handler.context['execution_id'])
+        self.assertIs(ctx1.logger, ctx2.logger)
+        self.assertEqual([handler], ctx2.logger.handlers)
+        self.assertEqual('e2', handler.context['execution_id'])
+
+    def test_logging_handler_not_reused_across_endpoints(self):
+        self._cleanup_logger('endpoint_type_handler')
+        local_ctx = context.CloudifyContext({
+            'local': True, 'task_id': 'endpoint_type_handler'})
+        manager_ctx = context.CloudifyContext({
+            'task_id': 'endpoint_type_handler'})
+        local_handler, = local_ctx.logger.handlers
+        manager_handler, = manager_ctx.logger.handlers
+        self.assertIsNot(local_handler, manager_handler)
+        self.assertIs(logs.stdout_log_out, local_handler.out_func)
+        self.assertIs(logs.amqp_log_out, manager_handler.out_func)
+
+    def test_logging_handler_from_endpoint(self):
+        self._cleanup_logger('endpoint_handler')
+        handler = logging.NullHandler()
+        for execution_id in ('e1', 'e2'):
+            ctx = context.CloudifyContext({
+                'local': True, 'task_id': 'endpoint_handler',
+                'execution_id': execution_id})
+            with patch.object(ctx._endpoint, 'get_logging_handler',
+                              return_value=handler) as get_handler:
+                self.assertEqual([handler], ctx.logger.handlers)
+            get_handler.assert_called_once_with()
+
+
+class TestHostIp(testtools.TestCase):
+    def test_host_ip_cached(self):
+        """Reading a known host_ip doesn't refetch the node instance."""
+        instance = NodeInstance('node_id', 'node', host_id='host_id')
+        ep = mock.Mock(**{
+            'get_node_instance.return_value': instance,
+            'get_host_node_instance_ip.return_value': '1.2.3.4'
+        })
+        ctx = _context_with_endpoint(ep)
+        self.assertEqual('1.2.3.4', ctx.host_ip)
+        ctx.update()
+        self.assertEqual('1.2.3.4', ctx.host_ip)
+        ep.get_node_instance.assert_called_once_with('node_id')
+        ep.get_host_node_instance_ip.assert_called_once_with(
+            host_id='host_id')
+
+
+class TestContextCapabilities(testtools.TestCase):
+    def test_str_does_not_fetch(self):
+        instance = mock.Mock()
+        caps = context.ContextCapabilities(mock.Mock(), instance)
+        self.assertIn('<unloaded>', str(caps))
+        self.assertFalse(instance.mock_calls)
+
+    def test_lookup_reads_current_values(self):
+        relationships = []
+        for target_id, props in [('node1', {'k1': 'v1'}),
+                                 ('node2', {'k2': 'v2'})]:
+            relationship = mock.Mock()
+            relationship.target.instance.id = target_id
+            relationship.target.instance.runtime_properties = props
+            relationships.append(relationship)
+        instance = mock.Mock(relationships=relationships)
+        caps = context.ContextCapabilities(mock.Mock(), instance)
+        self.assertEqual('v1', caps['k1'])
+        caps.get_all()['node1']['k1'] = 'new'
+        self.assertEqual('new', caps['k1'])
+        self.assertEqual('v2', caps['k2'])
+
+    def test_mock_context_without_node(self):
+        ctx = MockCloudifyContext()
+        self.assertIsInstance(ctx.capabilities, context.ContextCapabilities)
+
+    def test_patchable(self):
+        caps = context.ContextCapabilities(mock.Mock(), mock.Mock())
+        with patch.object(caps, '_find_item', return_value=(True, 'v')):
+            self.assertEqual('v', caps['k'])
+
+    def test_str_loaded(self):
+        target = mock.Mock()
+        target.target.instance.id = 'target_id'
+        target.target.instance.runtime_properties = {'k': 'v'}
+        instance = mock.Mock(relationships=[target])
+        caps = context.ContextCapabilities(mock.Mock(), instance)
+        self.assertEqual({'target_id': {'k': 'v'}}, caps.get_all())
+        self.assertIn("'k': 'v'", str(caps))
+
+
 class TestPropertiesUpdate(testtools.TestCase):
     ERR_CONFLICT = CloudifyClientError('conflict', status_code=409)
 
@@ -506,6 +608,13 @@ class TestPropertiesUpdate(testtools.TestCase):
 
         ep.update_node_instance.assert_called_once_with(instance)
 
+    def test_update_patchable(self):
+        """Plugins can patch .update() on the instance context object."""
+        ctx = _context_with_endpoint(mock.Mock())
+        with patch.object(ctx, 'update') as mock_update:
+            ctx.update()
+        mock_update.assert_called_once_with()
+
     def test_update_conflict_no_handler(self):
         """Version conflict without a handler function aborts the operation."""
         instance = NodeInstance('id', 'node_id')
@@ -151,6 +151,59 @@ class OperationTest(testtools.TestCase):
         self.assertEqual(len(warns), 1)
         self.assertIn('capabilities is deprecated', str(warns[0]))
 
+    def test_capabilities_multiple_nodes(self):
+        ctx = {
+            'node_id': '5678',
+        }
+
+        rest_client_mock.put_node_instance(
+            '5678',
+            relationships=[{'target_id': 'node1',
+                            'target_name': 'node1'},
+                           {'target_id': 'node2',
+                            'target_name': 'node2'}])
+
+        rest_client_mock.put_node_instance('node1',
+                                           runtime_properties={'k1': 'v1'})
+        rest_client_mock.put_node_instance('node2',
+                                           runtime_properties={'k2': 'v2'})
+
+        kwargs = {'__cloudify_context': ctx}
+        ctx = acquire_context(0, 0, **kwargs)
+        with warnings.catch_warnings(record=True):
+            self.assertEqual('v1', ctx.capabilities['k1'])
+            self.assertEqual('v2', ctx.capabilities['k2'])
+            self.assertNotIn('k3', ctx.capabilities)
+            self.assertRaises(
+                NonRecoverableError, lambda: ctx.capabilities['k3'])
+
+    def test_capabilities_multiple_nodes_clash(self):
+        ctx = {
+            'node_id': '5678',
+        }
+
+        rest_client_mock.put_node_instance(
+            '5678',
+            relationships=[{'target_id': 'node1',
+                            'target_name': 'node1'},
+                           {'target_id': 'node2',
+                            'target_name': 'node2'}])
+
+        rest_client_mock.put_node_instance(
+            'node1', runtime_properties={'k': 'v1', 'k1': 'v1'})
+        rest_client_mock.put_node_instance(
+            'node2', runtime_properties={'k': 'v2'})
+
+        kwargs = {'__cloudify_context': ctx}
+        ctx = acquire_context(0, 0, **kwargs)
+        with warnings.catch_warnings(record=True):
+            self.assertRaises(
+                NonRecoverableError, lambda: ctx.capabilities['k'])
+            self.assertRaises(
+                NonRecoverableError, lambda: 'k' in ctx.capabilities)
+            self.assertEqual('v1', ctx.capabilities['k1'])
+            self.assertIn('k1', ctx.capabilities)
+
     def test_instance_update(self):
         with patch.object(context.NodeInstanceContext,
                           'update') as mock_update:
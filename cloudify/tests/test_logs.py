@@ -14,6 +14,9 @@
 #    * See the License for the specific language governing permissions and
 #    * limitations under the License.
 
+import logging
+import sys
+
 import testtools
 
 from cloudify import logs
@@ -41,3 +44,27 @@ class TestLogs(testtools.TestCase):
                       logs.create_event_message_prefix(test_event))
         test_event['level'] = 'DEBUG'
         self.assertIsNone(logs.create_event_message_prefix(test_event))
+
+    def test_init_cloudify_logger_replaces_handlers(self):
+        logger = logging.getLogger('ctx.test_init_logger')
+        self.addCleanup(setattr, logger, 'handlers', [])
+        for _ in range(3):
+            logger.addHandler(logging.NullHandler())
+        handler = logging.NullHandler()
+        self.assertIs(logger,
+                      logs.init_cloudify_logger(handler, 'test_init_logger'))
+        self.assertEqual([handler], logger.handlers)
+        logs.init_cloudify_logger(handler, 'test_init_logger')
+        self.assertEqual([handler], logger.handlers)
+
+    def test_message_formatter(self):
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError:
+            record = logging.LogRecord('ctx', logging.ERROR, __file__, 0,
+                                       'failed: %s', ('x',), sys.exc_info())
+        formatted = logs._message_formatter.format(record)
+        self.assertEqual(logging.Formatter('%(message)s').format(record),
+                         formatted)
+        self.assertTrue(formatted.startswith('failed: x\n'))
+        self.assertIn('RuntimeError: boom', formatted)